@@ -1,18 +1,27 @@
 import os
 import logging
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask_executor import Executor
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, select
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool, StaticPool
 from werkzeug.middleware.proxy_fix import ProxyFix
+import atexit
+from collections import namedtuple
+import queue
 import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from uuid import uuid4
+from apscheduler.schedulers.background import BackgroundScheduler
 from dotenv import load_dotenv
 load_dotenv()
 
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging (set LOG_LEVEL=DEBUG for verbose output)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # Database setup
@@ -28,139 +37,425 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
 # Database configuration
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///newsbot.db")
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
+_database_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+if _database_uri in ("sqlite://", "sqlite:///:memory:"):
+    # An in-memory database only exists on its one connection, so share it
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "poolclass": StaticPool,
+        "connect_args": {"check_same_thread": False},
+    }
+elif _database_uri.startswith("sqlite"):
+    # Pooled connections move between request, scheduler and executor threads;
+    # wait on a locked database instead of failing straight away
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "connect_args": {"check_same_thread": False, "timeout": 30},
+    }
+elif os.environ.get("PGBOUNCER_TRANSACTION_MODE"):
+    # PgBouncer does the pooling; holding connections here would defeat it
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "poolclass": NullPool,
+    }
+else:
+    # Sized for request threads plus the scheduler and executor workers
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+    }
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+# Background task executor for slow request work
+app.config["EXECUTOR_TYPE"] = "thread"
+app.config["EXECUTOR_MAX_WORKERS"] = 8
+# Task results nobody polls for are dropped, oldest first, beyond this many
+app.config["EXECUTOR_FUTURES_MAX_LENGTH"] = 50
+
 # Initialize the app with the database extension
 db.init_app(app)
+executor = Executor(app)
+
+def _upgrade_news_log():
+    """Bring a news_log table created by an older version up to the current schema"""
+    columns = {column["name"] for column in inspect(db.engine).get_columns("news_log")}
+    if "message_zst" not in columns:
+        blob_type = NewsLog.__table__.c.message_zst.type.compile(dialect=db.engine.dialect)
+        db.session.execute(db.text(f"ALTER TABLE news_log ADD COLUMN message_zst {blob_type}"))
+        db.session.commit()
+        logger.info("Added message_zst column to news_log")
+    
+    # create_all() skips indexes on tables that already exist
+    for index in NewsLog.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
 
 # Import models and create tables
 with app.app_context():
     from models import NewsConfig, NewsLog
     db.create_all()
+    _upgrade_news_log()
 
 # Import news bot functionality
-from news_bot import fetch_news, send_whatsapp_message, format_news_message
+from news_bot import (fetch_news, send_whatsapp_message, format_news_message, news_cache,
+                      article_hashes, load_seen_articles, save_seen_articles)
 
-# Global variable to track if the bot is running
-bot_thread = None
-bot_running = False
+# Set at interpreter exit to stop the background threads without polling
+_shutdown = threading.Event()
 
-def news_bot_thread():
-    """Thread function to run the news bot periodically"""
-    global bot_running
-    
+# Pending NewsLog rows, written in batches by a background thread
+LOG_BATCH_SIZE = 100
+LOG_FLUSH_INTERVAL = 5  # Seconds
+LOG_RETENTION_DAYS = 30
+_log_queue = queue.Queue()
+
+def enqueue_log(config_id, message, status):
+    """Queue a NewsLog row to be written with the next batch"""
+    _log_queue.put({
+        'config_id': config_id,
+        'timestamp': datetime.now(),
+        '_message_text': '',
+        '_message_zst': NewsLog.compress_message(message),
+        'status': status,
+    })
+
+def _write_logs(batch):
+    """Insert a batch of queued NewsLog rows in one transaction"""
     with app.app_context():
-        while bot_running:
+        try:
+            db.session.bulk_insert_mappings(NewsLog, batch)
+            db.session.commit()
+        except Exception as e:
+            logger.error("Error writing %s logs: %s", len(batch), e)
+            db.session.rollback()
+
+def _log_flusher():
+    """Write queued logs every LOG_BATCH_SIZE entries or LOG_FLUSH_INTERVAL seconds"""
+    while not _shutdown.is_set():
+        batch = []
+        deadline = None
+        while len(batch) < LOG_BATCH_SIZE:
+            # Block until the first entry arrives, then collect until the deadline
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
             try:
-                # Get the active configuration
-                config = NewsConfig.query.filter_by(active=True).first()
-                
-                if config:
-                    logger.info(f"Running news bot with config: {config.topic}")
-                    # Fetch news with improved error handling
-                    articles, error_message = fetch_news(
-                        api_key=os.environ.get("NEWSDATA_API_KEY", ""),
-                        topic=config.topic,
-                        country=config.country,
-                        language=config.language
-                    )
-                    
-                    # Format the message with articles or error information
-                    message = format_news_message(articles, error_message, config.num_articles)
-                    
-                    # Log message status based on whether we found articles
-                    status = "success" if articles else "warning"
-                    
-                    # If we have an API key error, mark it as an error
-                    if error_message and "API key" in error_message:
-                        status = "error"
-                        logger.error(f"API key error: {error_message}")
-                    elif not articles:
-                        logger.warning(f"No news found: {error_message}")
-                    else:
-                        logger.info(f"Found {len(articles)} news articles")
-                    
-                    # Send the message
-                    send_success = send_whatsapp_message(
-                        message=message,
-                        to_number=config.whatsapp_number,
-                        twilio_sid=os.environ.get("TWILIO_ACCOUNT_SID", ""),
-                        twilio_token=os.environ.get("TWILIO_AUTH_TOKEN", ""),
-                        from_number=os.environ.get("TWILIO_WHATSAPP_NUMBER", "")
-                    )
-                    
-                    # Update status if message sending failed
-                    if not send_success:
-                        status = "error"
-                        logger.error("Failed to send WhatsApp message")
-                    
-                    # Log the message result
-                    log_entry = NewsLog(
-                        config_id=config.id,
-                        timestamp=datetime.now(),
-                        message=message[:500],  # Save first 500 chars
-                        status=status
-                    )
-                    db.session.add(log_entry)
-                    db.session.commit()
-                    
-                    # Log final status
-                    if status == "success":
-                        logger.info("News message sent successfully")
-                    elif status == "warning":
-                        logger.warning("News message sent with warnings")
-                    else:
-                        logger.error("Failed to process or send news")
-                
-                # Sleep for the interval period (convert minutes to seconds)
-                interval_seconds = config.interval * 60 if config else 3600
-                logger.info(f"Sleeping for {interval_seconds} seconds")
-                
-                # Sleep in smaller chunks to allow for graceful shutdown
-                for _ in range(interval_seconds // 10):
-                    if not bot_running:
-                        break
-                    time.sleep(10)
-                
-                if interval_seconds % 10 > 0 and bot_running:
-                    time.sleep(interval_seconds % 10)
-                
-            except Exception as e:
-                logger.error(f"Error in news bot thread: {str(e)}")
-                # Log the error
-                try:
-                    config = NewsConfig.query.filter_by(active=True).first()
-                    if config:
-                        log_entry = NewsLog(
-                            config_id=config.id,
-                            timestamp=datetime.now(),
-                            message=f"Error: {str(e)}",
-                            status="error"
-                        )
-                        db.session.add(log_entry)
-                        db.session.commit()
-                except Exception as log_error:
-                    logger.error(f"Error logging error: {str(log_error)}")
-                
-                # Sleep before retrying
-                time.sleep(60)
+                entry = _log_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if entry is None:
+                break  # Woken up for shutdown
+            batch.append(entry)
+            if deadline is None:
+                deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+        if batch:
+            _write_logs(batch)
+    _drain_logs()
+
+def _drain_logs():
+    """Write any logs still queued at shutdown"""
+    batch = []
+    while True:
+        try:
+            entry = _log_queue.get_nowait()
+        except queue.Empty:
+            break
+        if entry is not None:
+            batch.append(entry)
+    if batch:
+        _write_logs(batch)
+
+_log_thread = threading.Thread(target=_log_flusher, daemon=True)
+_log_thread.start()
+
+# In-process cache of the active configurations, invalidated when they are saved
+CONFIG_CHANNEL = "newsbot:config"
+_config_cache = {"value": [], "loaded": False, "version": 0}
+
+def get_active_configs():
+    """Return the active configurations, querying the database only on a cache miss"""
+    if not _config_cache["loaded"]:
+        version = _config_cache["version"]
+        configs = NewsConfig.query.filter_by(active=True).order_by(NewsConfig.id).all()
+        for config in configs:
+            # Detach so the cached instances outlive the current session
+            db.session.expunge(config)
+        if version == _config_cache["version"]:
+            _config_cache["value"] = configs
+            _config_cache["loaded"] = True
+        return configs
+    return _config_cache["value"]
+
+def get_active_config():
+    """Return the primary active configuration, or None if there is none"""
+    configs = get_active_configs()
+    return configs[0] if configs else None
+
+def invalidate_config_cache(publish=True):
+    """Drop the cached configuration here and, through Redis, in other workers"""
+    _config_cache["version"] += 1
+    _config_cache["loaded"] = False
+    _config_cache["value"] = []
+    if publish and news_cache is not None:
+        try:
+            news_cache.publish(CONFIG_CHANNEL, "invalidate")
+        except Exception as e:
+            logger.warning("Could not publish config invalidation: %s", e)
+
+def _config_listener():
+    """Invalidate the cached configuration when another worker saves it"""
+    while not _shutdown.is_set():
+        try:
+            pubsub = news_cache.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CONFIG_CHANNEL)
+            for _ in pubsub.listen():
+                invalidate_config_cache(publish=False)
+        except Exception as e:
+            logger.warning("Config invalidation listener error: %s", e)
+            # Retry after a pause, or return at once on shutdown
+            if _shutdown.wait(5):
+                break
+
+if news_cache is not None:
+    threading.Thread(target=_config_listener, daemon=True).start()
+
+# Background scheduler that runs the news job on its configured interval
+scheduler = BackgroundScheduler(job_defaults={'coalesce': True, 'max_instances': 1})
+NEWS_JOB_ID = 'news'
+
+def start_scheduler():
+    """Start the background scheduler if it is not already running"""
+    if not scheduler.running:
+        scheduler.start()
+
+def _stop_background():
+    """Stop the scheduler and write out pending logs at interpreter exit"""
+    _shutdown.set()
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    _log_queue.put(None)
+    _log_thread.join(timeout=LOG_FLUSH_INTERVAL)
+
+atexit.register(_stop_background)
+
+MAX_CONFIG_WORKERS = 8
+
+# Adaptive polling state: back off while the news is unchanged
+INTERVAL_BACKOFF = 1.5
+MAX_INTERVAL_FACTOR = 4
+_effective_interval = None
+_last_seen_hashes = load_seen_articles()
+
+def reset_interval():
+    """Forget the backed-off interval so the configured one applies again"""
+    global _effective_interval
+    _effective_interval = None
+
+def _adapt_interval(config, articles):
+    """Stretch the job interval when no new articles appeared, reset it when they did"""
+    global _effective_interval, _last_seen_hashes
+    
+    # A failed fetch says nothing about new content; keep the interval and seen set.
+    # An empty result ([]) is a successful fetch with nothing new and does back off
+    if articles is None:
+        return
+    
+    hashes = article_hashes(articles)
+    current = _effective_interval or config.interval
+    if hashes - _last_seen_hashes:
+        interval = config.interval
+    else:
+        interval = min(current * INTERVAL_BACKOFF, config.interval * MAX_INTERVAL_FACTOR)
+    
+    _last_seen_hashes = hashes
+    save_seen_articles(hashes)
+    
+    if interval != current and is_bot_running():
+        logger.info("Adjusting news interval to %.0f minutes", interval)
+        scheduler.reschedule_job(NEWS_JOB_ID, trigger='interval', minutes=interval)
+    _effective_interval = interval
+
+def _process_config(config):
+    """Fetch the news for one configuration and send it via WhatsApp"""
+    try:
+        logger.info("Running news bot with config: %s", config.topic)
+        # Fetch news with improved error handling
+        articles, error_message = fetch_news(
+            api_key=os.environ.get("NEWSDATA_API_KEY", ""),
+            topic=config.topic,
+            country=config.country,
+            language=config.language
+        )
+        
+        # Format the message with articles or error information
+        message = format_news_message(articles, error_message, config.num_articles)
+        
+        # Log message status based on whether we found articles
+        status = "success" if articles else "warning"
+        
+        # If we have an API key error, mark it as an error
+        if error_message and "API key" in error_message:
+            status = "error"
+            logger.error("API key error: %s", error_message)
+        elif not articles:
+            logger.warning("No news found: %s", error_message)
+        else:
+            logger.info("Found %s news articles", len(articles))
+        
+        # Send the message
+        send_success = send_whatsapp_message(
+            message=message,
+            to_number=config.whatsapp_number,
+            twilio_sid=os.environ.get("TWILIO_ACCOUNT_SID", ""),
+            twilio_token=os.environ.get("TWILIO_AUTH_TOKEN", ""),
+            from_number=os.environ.get("TWILIO_WHATSAPP_NUMBER", "")
+        )
+        
+        # Update status if message sending failed
+        if not send_success:
+            status = "error"
+            logger.error("Failed to send WhatsApp message")
+        
+        # Log the message result
+        enqueue_log(config.id, message[:500], status)  # Save first 500 chars
+        
+        # Log final status
+        if status == "success":
+            logger.info("News message sent successfully")
+        elif status == "warning":
+            logger.warning("News message sent with warnings")
+        else:
+            logger.error("Failed to process or send news")
+        
+        return articles
+    
+    except Exception as e:
+        logger.error("Error in news bot job: %s", e)
+        enqueue_log(config.id, f"Error: {str(e)}", "error")
+        return None
+
+def _process_config_in_context(config):
+    """Run _process_config in a worker thread under its own app context"""
+    with app.app_context():
+        return _process_config(config)
+
+def run_news_job():
+    """Scheduled job that fetches the news and sends it via WhatsApp"""
+    with app.app_context():
+        try:
+            configs = get_active_configs()
+            if not configs:
+                return
+            
+            # Configurations are independent network round trips, so fan them out
+            # over a thread pool; they share the pooled NewsData and Twilio connections
+            if len(configs) == 1:
+                results = [_process_config(configs[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(len(configs), MAX_CONFIG_WORKERS)) as pool:
+                    results = list(pool.map(_process_config_in_context, configs))
+            
+            # Poll less often while the news is unchanged
+            if any(result is None for result in results):
+                articles = None
+            else:
+                articles = [article for result in results for article in result]
+            _adapt_interval(configs[0], articles)
+        
+        except Exception as e:
+            logger.error("Error in news bot job: %s", e)
+        
+        # Warm the cache again just before the next tick
+        arm_cache_refresh()
+
+REFRESH_JOB_ID = 'refresh_news_cache'
+REFRESH_LOCK_KEY = "news:refresh-lock"
+REFRESH_LEAD = 60  # Seconds before the next news tick that the cache is refreshed
+
+def arm_cache_refresh():
+    """Schedule a one-shot cache refresh shortly before the next news tick"""
+    if news_cache is None:
+        return
+    job = scheduler.get_job(NEWS_JOB_ID)
+    if job is None or job.next_run_time is None:
+        return
+    run_at = job.next_run_time - timedelta(seconds=REFRESH_LEAD)
+    if run_at <= datetime.now(run_at.tzinfo):
+        # Too close to the tick; it will fetch for itself
+        return
+    scheduler.add_job(refresh_news_cache, 'date', run_date=run_at,
+                      id=REFRESH_JOB_ID, replace_existing=True)
+
+def refresh_news_cache():
+    """Scheduled job that refreshes the cached news for the active configuration"""
+    if not is_bot_running():
+        return
+    with app.app_context():
+        try:
+            # Only one process refreshes per window, however many run the bot
+            if not news_cache.set(REFRESH_LOCK_KEY, os.getpid(), nx=True, ex=REFRESH_LEAD):
+                return
+            config = get_active_config()
+            if config:
+                fetch_news(
+                    api_key=os.environ.get("NEWSDATA_API_KEY", ""),
+                    topic=config.topic,
+                    country=config.country,
+                    language=config.language,
+                    use_cache=False
+                )
+        except Exception as e:
+            logger.error("Error refreshing news cache: %s", e)
+
+def purge_old_logs():
+    """Scheduled job that deletes logs older than the retention period"""
+    with app.app_context():
+        try:
+            cutoff = datetime.now() - timedelta(days=LOG_RETENTION_DAYS)
+            deleted = NewsLog.query.filter(NewsLog.timestamp < cutoff).delete()
+            db.session.commit()
+            logger.info("Purged %s logs older than %s days", deleted, LOG_RETENTION_DAYS)
+        except Exception as e:
+            logger.error("Error purging old logs: %s", e)
+            db.session.rollback()
+
+# Purge expired logs nightly
+scheduler.add_job(purge_old_logs, 'cron', hour=3, id='purge_old_logs', replace_existing=True)
+start_scheduler()
+
+def is_bot_running():
+    """Whether the news job is currently scheduled"""
+    return scheduler.get_job(NEWS_JOB_ID) is not None
+
+# Lightweight homepage log rows with the attributes the template reads from NewsLog
+LogConfigView = namedtuple('LogConfigView', 'topic')
+LogView = namedtuple('LogView', 'id config_id timestamp status message config')
 
 @app.route('/')
 def index():
     """Homepage route showing the status of the bot and latest logs"""
-    global bot_running
-    
-    config = NewsConfig.query.filter_by(active=True).first()
-    logs = NewsLog.query.order_by(NewsLog.timestamp.desc()).limit(10).all()
+    config = get_active_config()
+    # Logs are written in batches, so the newest may appear up to LOG_FLUSH_INTERVAL late
+    rows = db.session.execute(
+        select(NewsLog.id, NewsLog.config_id, NewsLog.timestamp, NewsLog.status,
+               NewsLog._message_zst.label('message_zst'),
+               NewsLog._message_text.label('message_text'),
+               NewsConfig.topic)
+        .outerjoin(NewsConfig)
+        .order_by(NewsLog.timestamp.desc())
+        .limit(10)
+    ).all()
+    logs = [
+        LogView(row.id, row.config_id, row.timestamp, row.status,
+                NewsLog.read_message(row.message_zst, row.message_text),
+                LogConfigView(row.topic))
+        for row in rows
+    ]
     
     return render_template('index.html', 
                           config=config, 
                           logs=logs, 
-                          bot_running=bot_running)
+                          bot_running=is_bot_running())
 
 @app.route('/configure', methods=['GET', 'POST'])
 def configure():
@@ -196,6 +491,13 @@ def configure():
                 existing_config.interval = interval
                 existing_config.num_articles = num_articles
                 db.session.commit()
+                
+                # Apply the new interval to the running job
+                if is_bot_running():
+                    reset_interval()
+                    scheduler.reschedule_job(NEWS_JOB_ID, trigger='interval', minutes=interval)
+                    arm_cache_refresh()
+                invalidate_config_cache()
                 flash('Configuration updated successfully', 'success')
             else:
                 # Create new config
@@ -210,26 +512,25 @@ def configure():
                 )
                 db.session.add(new_config)
                 db.session.commit()
+                invalidate_config_cache()
                 flash('Configuration created successfully', 'success')
             
             return redirect(url_for('index'))
         
         except Exception as e:
-            logger.error(f"Error saving configuration: {str(e)}")
+            logger.error("Error saving configuration: %s", e)
             flash(f'Error saving configuration: {str(e)}', 'danger')
     
     # GET request or form validation failed
-    config = NewsConfig.query.filter_by(active=True).first()
+    config = get_active_config()
     return render_template('configure.html', config=config)
 
 @app.route('/start_bot')
 def start_bot():
-    """Start the news bot thread"""
-    global bot_thread, bot_running
-    
-    if not bot_running:
+    """Start the news bot job"""
+    if not is_bot_running():
         # Check if there's an active configuration
-        config = NewsConfig.query.filter_by(active=True).first()
+        config = get_active_config()
         if not config:
             flash('Please configure the bot first', 'warning')
             return redirect(url_for('configure'))
@@ -245,11 +546,13 @@ def start_bot():
             flash('Twilio environment variables not set', 'danger')
             return redirect(url_for('index'))
         
-        # Start the bot thread
-        bot_running = True
-        bot_thread = threading.Thread(target=news_bot_thread)
-        bot_thread.daemon = True
-        bot_thread.start()
+        # Schedule the bot job
+        reset_interval()
+        # Send the first update straight away, then on every interval
+        scheduler.add_job(run_news_job, 'interval', minutes=config.interval,
+                          id=NEWS_JOB_ID, replace_existing=True,
+                          next_run_time=datetime.now())
+        start_scheduler()
         
         flash('News bot started', 'success')
     else:
@@ -259,81 +562,120 @@ def start_bot():
 
 @app.route('/stop_bot')
 def stop_bot():
-    """Stop the news bot thread"""
-    global bot_running
-    
-    if bot_running:
-        bot_running = False
-        flash('News bot stopping. It may take a few seconds to complete.', 'success')
+    """Stop the news bot job"""
+    if is_bot_running():
+        scheduler.remove_job(NEWS_JOB_ID)
+        if scheduler.get_job(REFRESH_JOB_ID):
+            scheduler.remove_job(REFRESH_JOB_ID)
+        flash('News bot stopped', 'success')
     else:
         flash('News bot is not running', 'info')
     
     return redirect(url_for('index'))
 
+def _do_test_message(config_id, use_cache=True):
+    """Fetch the news and send a test message for the given configuration"""
+    with app.app_context():
+        try:
+            config = db.session.get(NewsConfig, config_id)
+            if not config:
+                logger.warning("Test message skipped: config %s no longer exists", config_id)
+                return False
+            
+            # Fetch a single news article for testing
+            articles, error_message = fetch_news(
+                api_key=os.environ.get("NEWSDATA_API_KEY", ""),
+                topic=config.topic,
+                country=config.country,
+                language=config.language,
+                use_cache=use_cache
+            )
+            
+            # Format message with test header
+            message = format_news_message(articles, error_message, 1)
+            message = "🧪 TEST MESSAGE 🧪\n\n" + message
+            
+            # Send the message
+            send_success = send_whatsapp_message(
+                message=message,
+                to_number=config.whatsapp_number,
+                twilio_sid=os.environ.get("TWILIO_ACCOUNT_SID", ""),
+                twilio_token=os.environ.get("TWILIO_AUTH_TOKEN", ""),
+                from_number=os.environ.get("TWILIO_WHATSAPP_NUMBER", "")
+            )
+            
+            # Log the message
+            enqueue_log(config.id, message[:500], "test")  # Save first 500 chars
+            
+            if send_success:
+                logger.info("Test message sent successfully")
+            else:
+                logger.warning("Error sending test message via Twilio")
+            return send_success
+        
+        except Exception as e:
+            logger.error("Error sending test message: %s", e)
+            db.session.rollback()
+            return False
+
+def _do_clear_logs():
+    """Delete all logs from the database"""
+    with app.app_context():
+        try:
+            if db.engine.dialect.name == "postgresql":
+                # TRUNCATE is constant-time, unlike a row-by-row DELETE
+                db.session.execute(db.text("TRUNCATE news_log"))
+            else:
+                NewsLog.query.delete()
+            db.session.commit()
+            logger.info("Logs cleared successfully")
+            return True
+        except Exception as e:
+            logger.error("Error clearing logs: %s", e)
+            db.session.rollback()
+            return False
+
 @app.route('/test_message')
 def test_message():
-    """Send a test message to verify the configuration"""
-    try:
-        config = NewsConfig.query.filter_by(active=True).first()
-        
-        if not config:
-            flash('Please configure the bot first', 'warning')
-            return redirect(url_for('configure'))
-        
-        # Fetch a single news article for testing
-        articles, error_message = fetch_news(
-            api_key=os.environ.get("NEWSDATA_API_KEY", ""),
-            topic=config.topic,
-            country=config.country,
-            language=config.language
-        )
-        
-        # Format message with test header
-        message = format_news_message(articles, error_message, 1)
-        message = "🧪 TEST MESSAGE 🧪\n\n" + message
-        
-        # Send the message
-        send_success = send_whatsapp_message(
-            message=message,
-            to_number=config.whatsapp_number,
-            twilio_sid=os.environ.get("TWILIO_ACCOUNT_SID", ""),
-            twilio_token=os.environ.get("TWILIO_AUTH_TOKEN", ""),
-            from_number=os.environ.get("TWILIO_WHATSAPP_NUMBER", "")
-        )
-        
-        # Log the message
-        log_entry = NewsLog(
-            config_id=config.id,
-            timestamp=datetime.now(),
-            message=message[:500],  # Save first 500 chars
-            status="test"
-        )
-        db.session.add(log_entry)
-        db.session.commit()
-        
-        if send_success:
-            flash('Test message sent successfully', 'success')
-        else:
-            flash('Error sending test message via Twilio', 'warning')
+    """Queue a test message to verify the configuration"""
+    config = get_active_config()
     
-    except Exception as e:
-        logger.error(f"Error sending test message: {str(e)}")
-        flash(f'Error sending test message: {str(e)}', 'danger')
+    if not config:
+        flash('Please configure the bot first', 'warning')
+        return redirect(url_for('configure'))
+    
+    # ?no_cache=1 bypasses the news cache
+    task_id = f'test-{uuid4()}'
+    executor.submit_stored(task_id, _do_test_message, config.id,
+                           use_cache=not request.args.get('no_cache'))
+    flash(f'Test message queued (task {task_id})', 'info')
     
     return redirect(url_for('index'))
 
 @app.route('/clear_logs')
 def clear_logs():
-    """Clear all logs from the database"""
-    try:
-        NewsLog.query.delete()
-        db.session.commit()
-        flash('Logs cleared successfully', 'success')
-    except Exception as e:
-        logger.error(f"Error clearing logs: {str(e)}")
-        flash(f'Error clearing logs: {str(e)}', 'danger')
+    """Queue clearing all logs from the database"""
+    task_id = f'clear-logs-{uuid4()}'
+    executor.submit_stored(task_id, _do_clear_logs)
+    flash('Clearing logs queued', 'info')
     
     return redirect(url_for('index'))
 
+@app.route('/task_status/<task_id>')
+def task_status(task_id):
+    """Report the status of a queued background task"""
+    done = executor.futures.done(task_id)
+    if done is None:
+        return jsonify(task_id=task_id, status='unknown'), 404
+    if not done:
+        return jsonify(task_id=task_id, status='pending'), 202
+    
+    future = executor.futures.pop(task_id)
+    try:
+        success = future.result()
+    except Exception as e:
+        return jsonify(task_id=task_id, status='error', error=str(e))
+    return jsonify(task_id=task_id, status='success' if success else 'failed')
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -10,6 +10,9 @@ class Config:
     # NewsData.io configuration
     NEWSDATA_API_KEY = os.environ.get("NEWSDATA_API_KEY", "")
     
+    # Redis cache for NewsData.io results (optional)
+    REDIS_URL = os.environ.get("REDIS_URL", "")
+    
     # Default news configuration
     DEFAULT_TOPIC = "world news"
     DEFAULT_COUNTRY = "us"
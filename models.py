@@ -1,3 +1,4 @@
+import zstandard
 from app import db
 from datetime import datetime
 
@@ -22,11 +23,37 @@ class NewsConfig(db.Model):
 
 class NewsLog(db.Model):
     """Log of news messages sent"""
+    __table_args__ = (
+        db.Index('ix_newslog_config_ts', 'config_id', 'timestamp'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
-    config_id = db.Column(db.Integer, db.ForeignKey('news_config.id'), nullable=False)
-    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.now)
-    message = db.Column(db.Text, nullable=False)  # Store the first part of the message
+    config_id = db.Column(db.Integer, db.ForeignKey('news_config.id'), nullable=False, index=True)
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.now, index=True)
+    _message_text = db.Column('message', db.Text, nullable=False, default='')  # Plain text, kept for rows written before compression
+    _message_zst = db.Column('message_zst', db.LargeBinary, nullable=True)  # zstd-compressed first part of the message
     status = db.Column(db.String(20), nullable=False)  # success, error, warning, test
     
+    @staticmethod
+    def compress_message(text):
+        """Compress message text for storage"""
+        return zstandard.ZstdCompressor().compress(text[:500].encode())
+    
+    @staticmethod
+    def read_message(blob, text):
+        """Return the stored message, falling back to the plain-text column for old rows"""
+        if blob is None:
+            return text
+        return zstandard.ZstdDecompressor().decompress(blob).decode()
+    
+    @property
+    def message(self):
+        return self.read_message(self._message_zst, self._message_text)
+    
+    @message.setter
+    def message(self, text):
+        self._message_zst = self.compress_message(text)
+        self._message_text = ''
+    
     def __repr__(self):
         return f'<NewsLog {self.timestamp} {self.status}>'
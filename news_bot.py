@@ -1,14 +1,70 @@
 import os
+import time
+import hashlib
 import logging
+import orjson
+from collections import ChainMap
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlencode
+import redis
 import requests
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-def fetch_news(api_key, topic="world news", country="us", language="en", max_retries=2):
+NEWSDATA_URL = "https://newsdata.io/api/1/news"
+
+# Optional Redis cache for NewsData.io results (disabled when REDIS_URL is unset)
+NEWS_CACHE_TTL = 300  # Seconds
+REDIS_URL = os.environ.get("REDIS_URL", "")
+news_cache = redis.Redis.from_url(REDIS_URL, decode_responses=True) if REDIS_URL else None
+
+# Shared HTTP session so the NewsData.io connection is kept alive between calls
+_session = requests.Session()
+
+@lru_cache(maxsize=4)
+def _twilio_client(sid, token):
+    """Return a Twilio client for the given credentials, reusing its connection pool"""
+    return Client(sid, token)
+
+def _news_cache_key(topic, country, language):
+    """Build the Redis key for a (topic, country, language) query"""
+    digest = hashlib.sha1(f"{topic}|{country}|{language}".encode()).hexdigest()
+    return f"news:{digest}"
+
+# Redis key holding the hashes of the articles returned by the last bot tick
+SEEN_ARTICLES_KEY = "news:seen"
+
+def article_hashes(articles):
+    """Return the set of link hashes identifying the given articles"""
+    return {hashlib.md5((article.get("link") or "").encode()).hexdigest() for article in articles or []}
+
+def load_seen_articles():
+    """Load the persisted article hashes from the last bot tick"""
+    if news_cache is None:
+        return set()
+    try:
+        return set(news_cache.smembers(SEEN_ARTICLES_KEY))
+    except redis.RedisError as e:
+        logger.warning("Could not load seen articles: %s", e)
+        return set()
+
+def save_seen_articles(hashes):
+    """Persist the article hashes from the current bot tick"""
+    if news_cache is None:
+        return
+    try:
+        pipe = news_cache.pipeline()
+        pipe.delete(SEEN_ARTICLES_KEY)
+        if hashes:
+            pipe.sadd(SEEN_ARTICLES_KEY, *hashes)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Could not save seen articles: %s", e)
+
+def fetch_news(api_key, topic="world news", country="us", language="en", max_retries=2, use_cache=True):
     """
     Fetch news articles from NewsData.io API
     
@@ -18,17 +74,29 @@ def fetch_news(api_key, topic="world news", country="us", language="en", max_ret
         country (str): Country code (e.g., 'us', 'in')
         language (str): Language code (e.g., 'en')
         max_retries (int): Maximum number of retries for API call
+        use_cache (bool): Whether to serve results from the Redis cache if available
         
     Returns:
-        tuple: (articles list, error message) - articles will be None if there's an error
+        tuple: (articles list, error message) - articles will be None if there's an error,
+            or an empty list if the search succeeded but found nothing
     """
     # Validate inputs
     if not api_key:
         return None, "Missing API key"
     
-    # URL-encode the topic for proper API request
-    import urllib.parse
-    encoded_topic = urllib.parse.quote(topic)
+    # Serve from cache when possible
+    cache_key = _news_cache_key(topic, country, language)
+    if news_cache is not None and use_cache:
+        try:
+            cached = news_cache.get(cache_key)
+            if cached:
+                logger.debug("Serving news from cache")
+                return orjson.loads(cached), None
+        except redis.RedisError as e:
+            logger.warning("Redis cache unavailable: %s", e)
+    
+    # Encode the query once for all attempts
+    query = urlencode({"apikey": api_key, "q": topic, "country": country, "language": language})
     
     # Track retry attempts
     retry_count = 0
@@ -36,19 +104,13 @@ def fetch_news(api_key, topic="world news", country="us", language="en", max_ret
     
     while retry_count <= max_retries:
         try:
-            # Construct the URL
-            url = (
-                f"https://newsdata.io/api/1/news?apikey={api_key}"
-                f"&q={encoded_topic}&country={country}&language={language}"
-            )
-            
-            logger.debug(f"Fetching news from URL (attempt {retry_count+1})")
+            logger.debug("Fetching news from URL (attempt %s)", retry_count + 1)
             
             # Make the request with timeout
-            response = requests.get(url, timeout=10)
+            response = _session.get(NEWSDATA_URL, params=query, timeout=10)
             
             # Debug the raw response
-            logger.debug(f"Response status code: {response.status_code}")
+            logger.debug("Response status code: %s", response.status_code)
             
             # Check for HTTP errors
             if response.status_code != 200:
@@ -62,14 +124,20 @@ def fetch_news(api_key, topic="world news", country="us", language="en", max_ret
                 return None, error_msg
             
             # Parse the JSON response
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Log the response structure for debugging
-            logger.debug(f"Response data structure: {list(data.keys())}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response data structure: %s", list(data))
             
             # Check if we got successful results
             if data.get("status") == "success" and data.get("results") and len(data["results"]) > 0:
-                logger.info(f"Fetched {len(data['results'])} news articles")
+                logger.info("Fetched %s news articles", len(data['results']))
+                if news_cache is not None:
+                    try:
+                        news_cache.setex(cache_key, NEWS_CACHE_TTL, orjson.dumps(data["results"]))
+                    except redis.RedisError as e:
+                        logger.warning("Could not cache news results: %s", e)
                 return data["results"], None
             else:
                 # Check for specific error messages from the API
@@ -77,13 +145,13 @@ def fetch_news(api_key, topic="world news", country="us", language="en", max_ret
                     error_message = "API error"
                     if isinstance(data.get("results"), dict):
                         error_message = data.get("results", {}).get("message", "Unknown API error")
-                    logger.warning(f"API error: {error_message}")
+                    logger.warning("API error: %s", error_message)
                     return None, f"NewsData.io API error: {error_message}"
                 elif not data.get("results") or len(data["results"]) == 0:
                     logger.warning("No news articles found for the given criteria")
-                    return None, "No news articles found for the given search criteria. Try a different topic or country."
+                    return [], "No news articles found for the given search criteria. Try a different topic or country."
                 else:
-                    logger.warning(f"Unexpected API response: {data}")
+                    logger.warning("Unexpected API response: %s", data)
                     return None, "Unexpected API response format"
                 
         except requests.exceptions.RequestException as e:
@@ -99,13 +167,21 @@ def fetch_news(api_key, topic="world news", country="us", language="en", max_ret
         # Increment retry counter
         retry_count += 1
         if retry_count <= max_retries:
-            logger.info(f"Retrying API call ({retry_count}/{max_retries})...")
-            import time
+            logger.info("Retrying API call (%s/%s)...", retry_count, max_retries)
             time.sleep(2)  # Wait 2 seconds before retrying
     
     # If we got here, all retries failed
     return None, last_error
 
+# Template for a single article in the WhatsApp message
+ARTICLE_TMPL = "🗞️ *{title}*\n📍{source_id} | 🕒 {pubDate}\n🔗 {link}"
+ARTICLE_DEFAULTS = {
+    "title": "No title",
+    "source_id": "Unknown",
+    "pubDate": "Unknown date",
+    "link": "#",
+}
+
 def format_news_message(articles, error_message=None, num_articles=3):
     """
     Format news articles into a WhatsApp message
@@ -144,30 +220,23 @@ def format_news_message(articles, error_message=None, num_articles=3):
         return "\n\n".join(messages)
     
     # Process articles if available
-    # Add each article (limited to num_articles)
-    for article in articles[:num_articles]:
-        title = article.get("title", "No title")
-        source = article.get("source_id", "Unknown")
-        pub_date = article.get("pubDate", "Unknown date")
-        link = article.get("link", "#")
-        
+    # Add each article (limited to num_articles) into a pre-sized list
+    selected = articles[:num_articles]
+    messages.extend([None] * (len(selected) + 1))
+    for i, article in enumerate(selected, start=1):
         # Create a rich text message with emoji
-        article_text = f"🗞️ *{title}*\n📍{source} | 🕒 {pub_date}\n🔗 {link}"
+        article_text = ARTICLE_TMPL.format_map(ChainMap(article, ARTICLE_DEFAULTS))
         
-        # Add a description if available (limited to 100 chars)
+        # Add a description if available (truncated to 100 chars)
         description = article.get("description", "")
-        if description and len(description) > 0:
-            # Truncate long descriptions
-            if len(description) > 100:
-                description = description[:97] + "..."
-            article_text += f"\n\n{description}"
+        if description:
+            article_text += "\n\n" + (description[:97] + "..." if len(description) > 100 else description)
         
-        messages.append(article_text)
+        messages[i] = article_text
     
     # Add footer with timestamp
-    from datetime import datetime
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    messages.append(f"⏱️ Updated: {timestamp}")
+    messages[-1] = f"⏱️ Updated: {timestamp}"
     
     # Return the joined message
     return "\n\n".join(messages)
@@ -187,8 +256,8 @@ def send_whatsapp_message(message, to_number, twilio_sid, twilio_token, from_num
         bool: True if successful, False otherwise
     """
     try:
-        # Initialize Twilio client
-        client = Client(twilio_sid, twilio_token)
+        # Reuse the Twilio client for these credentials
+        client = _twilio_client(twilio_sid, twilio_token)
         
         # Send the message
         message_obj = client.messages.create(
@@ -197,12 +266,12 @@ def send_whatsapp_message(message, to_number, twilio_sid, twilio_token, from_num
             to=to_number
         )
         
-        logger.info(f"Message sent successfully with SID: {message_obj.sid}")
+        logger.info("Message sent successfully with SID: %s", message_obj.sid)
         return True
         
     except TwilioRestException as e:
-        logger.error(f"Twilio error: {str(e)}")
+        logger.error("Twilio error: %s", e)
         return False
     except Exception as e:
-        logger.error(f"Unexpected error sending WhatsApp message: {str(e)}")
+        logger.error("Unexpected error sending WhatsApp message: %s", e)
         return False
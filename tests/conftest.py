@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# Use an in-memory database and no Redis before the app module is imported
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.pop("REDIS_URL", None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """Empty the tables and the config cache after every test"""
+    from app import app, db, invalidate_config_cache, NewsConfig, NewsLog
+
+    yield
+    with app.app_context():
+        NewsLog.query.delete()
+        NewsConfig.query.delete()
+        db.session.commit()
+    invalidate_config_cache()
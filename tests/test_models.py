@@ -0,0 +1,29 @@
+from app import NewsLog
+
+
+def test_message_round_trips_through_compression():
+    log = NewsLog(config_id=1, status="test")
+    log.message = "📰 *LATEST NEWS UPDATES* 📰"
+
+    assert log._message_zst is not None
+    assert log._message_text == ''
+    assert log.message == "📰 *LATEST NEWS UPDATES* 📰"
+
+
+def test_message_falls_back_to_plain_text_rows():
+    assert NewsLog.read_message(None, "old plain text") == "old plain text"
+
+
+def test_upgrade_creates_missing_news_log_indexes():
+    from sqlalchemy import inspect
+
+    from app import app, db, _upgrade_news_log
+
+    with app.app_context():
+        db.session.execute(db.text("DROP INDEX ix_newslog_config_ts"))
+        db.session.commit()
+
+        _upgrade_news_log()
+
+        names = {index["name"] for index in inspect(db.engine).get_indexes("news_log")}
+        assert {"ix_newslog_config_ts", "ix_news_log_config_id", "ix_news_log_timestamp"} <= names
@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+
+import app as app_module
+from app import app, db, invalidate_config_cache, run_news_job, scheduler, NEWS_JOB_ID
+from app import NewsConfig, NewsLog
+
+
+def test_run_news_job_sends_for_each_active_config(monkeypatch):
+    sent = []
+
+    def fake_fetch_news(api_key, topic, country, language):
+        return [{"title": topic, "link": f"https://example.com/{topic}"}], None
+
+    def fake_send_whatsapp_message(message, to_number, twilio_sid, twilio_token, from_number):
+        sent.append(to_number)
+        return True
+
+    monkeypatch.setattr(app_module, "fetch_news", fake_fetch_news)
+    monkeypatch.setattr(app_module, "send_whatsapp_message", fake_send_whatsapp_message)
+
+    with app.app_context():
+        db.session.add_all([
+            NewsConfig(topic="tech", whatsapp_number="whatsapp:+10000000001"),
+            NewsConfig(topic="sports", whatsapp_number="whatsapp:+10000000002"),
+        ])
+        db.session.commit()
+    invalidate_config_cache()
+
+    run_news_job()
+
+    assert sorted(sent) == ["whatsapp:+10000000001", "whatsapp:+10000000002"]
+
+
+def test_index_lists_logs_with_message_and_config_topic(monkeypatch):
+    rendered = {}
+
+    def fake_render_template(template, **context):
+        rendered.update(context)
+        return ""
+
+    monkeypatch.setattr(app_module, "render_template", fake_render_template)
+
+    with app.app_context():
+        config = NewsConfig(topic="world", whatsapp_number="whatsapp:+10000000003")
+        db.session.add(config)
+        db.session.flush()
+        log = NewsLog(config_id=config.id, status="test")
+        log.message = "hello"
+        db.session.add(log)
+        db.session.commit()
+
+    app.test_client().get("/")
+
+    # Each log exposes the attributes the template reads from NewsLog
+    [log] = rendered["logs"]
+    assert log.message == "hello"
+    assert log.status == "test"
+    assert log.config.topic == "world"
+
+
+def test_start_bot_runs_the_first_tick_immediately(monkeypatch):
+    monkeypatch.setenv("NEWSDATA_API_KEY", "key")
+    monkeypatch.setenv("TWILIO_ACCOUNT_SID", "sid")
+    monkeypatch.setenv("TWILIO_AUTH_TOKEN", "token")
+    monkeypatch.setenv("TWILIO_WHATSAPP_NUMBER", "whatsapp:+10000000000")
+
+    with app.app_context():
+        db.session.add(NewsConfig(topic="world", whatsapp_number="whatsapp:+10000000004", interval=60))
+        db.session.commit()
+    invalidate_config_cache()
+
+    # Keep the job from actually firing while we inspect it
+    scheduler.pause()
+    try:
+        before = datetime.now()
+        app.test_client().get("/start_bot")
+        job = scheduler.get_job(NEWS_JOB_ID)
+        assert job is not None
+        assert job.next_run_time.replace(tzinfo=None) <= before + timedelta(minutes=1)
+    finally:
+        app.test_client().get("/stop_bot")
+        scheduler.resume()
+
+
+def test_cache_refresh_is_armed_just_before_the_next_tick(monkeypatch):
+    monkeypatch.setattr(app_module, "news_cache", object())
+
+    scheduler.pause()
+    try:
+        next_run = datetime.now() + timedelta(minutes=30)
+        scheduler.add_job(run_news_job, 'interval', minutes=60, id=NEWS_JOB_ID,
+                          replace_existing=True, next_run_time=next_run)
+        app_module.arm_cache_refresh()
+        refresh = scheduler.get_job(app_module.REFRESH_JOB_ID)
+        assert refresh is not None
+        assert refresh.next_run_time.replace(tzinfo=None) == next_run - timedelta(seconds=app_module.REFRESH_LEAD)
+
+        # No refresh when the tick is already due within the lead time
+        scheduler.remove_job(app_module.REFRESH_JOB_ID)
+        scheduler.modify_job(NEWS_JOB_ID, next_run_time=datetime.now() + timedelta(seconds=10))
+        app_module.arm_cache_refresh()
+        assert scheduler.get_job(app_module.REFRESH_JOB_ID) is None
+    finally:
+        for job_id in (NEWS_JOB_ID, app_module.REFRESH_JOB_ID):
+            if scheduler.get_job(job_id):
+                scheduler.remove_job(job_id)
+        scheduler.resume()
+
+
+def test_stored_task_results_are_bounded(monkeypatch):
+    monkeypatch.setattr(app_module, "_do_clear_logs", lambda: True)
+    client = app.test_client()
+
+    limit = app.config["EXECUTOR_FUTURES_MAX_LENGTH"]
+    for _ in range(limit + 10):
+        client.get("/clear_logs")
+
+    assert len(app_module.executor.futures) == limit
+
+
+def test_adapt_interval_backs_off_on_unchanged_or_empty_news(monkeypatch):
+    monkeypatch.setattr(app_module, "_last_seen_hashes", set())
+    app_module.reset_interval()
+    config = NewsConfig(topic="world", whatsapp_number="whatsapp:+1", interval=60)
+    article = {"title": "A", "link": "https://example.com/a"}
+
+    # New content keeps the configured interval
+    app_module._adapt_interval(config, [article])
+    assert app_module._effective_interval == 60
+
+    # Unchanged content backs off
+    app_module._adapt_interval(config, [article])
+    assert app_module._effective_interval == 90
+
+    # A failed fetch changes neither the interval nor the seen set
+    app_module._adapt_interval(config, None)
+    assert app_module._effective_interval == 90
+    app_module._adapt_interval(config, [article])
+    assert app_module._effective_interval == 135
+
+    # An empty result is a quiet period and backs off, up to the cap
+    app_module._adapt_interval(config, [])
+    assert app_module._effective_interval == 202.5
+    app_module._adapt_interval(config, [])
+    assert app_module._effective_interval == 240
+
+    # Fresh content resets to the configured interval
+    app_module._adapt_interval(config, [{"title": "B", "link": "https://example.com/b"}])
+    assert app_module._effective_interval == 60
+    app_module.reset_interval()
+
+
+def test_fetch_news_returns_empty_list_for_no_results(monkeypatch):
+    import news_bot
+
+    class Response:
+        status_code = 200
+        content = b'{"status": "success", "results": []}'
+
+    monkeypatch.setattr(news_bot._session, "get", lambda *args, **kwargs: Response())
+
+    articles, error_message = news_bot.fetch_news("key", use_cache=False)
+
+    assert articles == []
+    assert "No news articles found" in error_message